@@ -66,15 +66,44 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 __version__ = "1.2"  # please report bugs, suggestions etc at https://github.com/paulh-rnd/TabbedBoxMaker ###
 
 import os
-import sys
 import inkex
-import simplestyle
 import gettext
-import math
-from copy import deepcopy
 _ = gettext.gettext
 
 linethickness = 1  # default unless overridden by settings
+# stroke style shared by every generated path, rebuilt when linethickness changes
+lineStyle = {'stroke': '#000000', 'stroke-width': str(linethickness), 'fill': 'none'}
+
+# Faces present for each box type, as (tp, bm, ft, bk, lt, rt)
+# unknown box types fall back to boxtype 1, the fully enclosed box
+boxTypeFaces = {
+    1: (True, True, True, True, True, True),      # fully enclosed
+    2: (False, True, True, True, True, True),     # one side open
+    3: (False, True, False, True, True, True),    # two sides open
+    4: (False, True, False, True, True, False),   # three sides open
+    5: (False, False, True, True, True, True),    # opposite ends open
+    6: (False, True, False, False, True, False),  # two panels only
+}
+
+# Initial tabInfo bits for each tab style, as (tp, bm, ft, bk, lt, rt)
+# unknown tab styles fall back to style 0, XY symmetric
+tabStyleInfo = {
+    0: (0b0000, 0b0000, 0b1010, 0b1010, 0b1111, 0b1111),  # XY symmetric
+    1: (0b1111, 0b1111, 0b1111, 0b1111, 0b1111, 0b1111),  # Rotationally symmetric (Waffle-blocks)
+    2: (0b0110, 0b1100, 0b1100, 0b1001, 0b1100, 0b0110),  # Antisymmetric (deprecated)
+}
+
+# Tab bits to fix on the neighbouring faces when a face is missing, as
+# (missing face, ((neighbour, bit), ...)); faces are indexed in the
+# (tp, bm, ft, bk, lt, rt) order used above, in the order they are applied
+missingFaceTabBits = (
+    (0, ((3, 0b0010), (2, 0b1000), (4, 0b0001), (5, 0b0100))),  # tp
+    (1, ((3, 0b1000), (2, 0b0010), (4, 0b0100), (5, 0b0001))),  # bm
+    (2, ((0, 0b1000), (1, 0b1000), (4, 0b1000), (5, 0b1000))),  # ft
+    (3, ((0, 0b0010), (1, 0b0010), (4, 0b0010), (5, 0b0010))),  # bk
+    (4, ((0, 0b0100), (1, 0b0001), (3, 0b0001), (2, 0b0001))),  # lt
+    (5, ((0, 0b0001), (1, 0b0100), (3, 0b0100), (2, 0b0100))),  # rt
+)
 
 
 def log(text):
@@ -92,8 +121,7 @@ def newGroup(canvas):
 
 def getLine(XYstring):
     line = inkex.PathElement()
-    line.style = {'stroke': '#000000',
-                  'stroke-width': str(linethickness), 'fill': 'none'}
+    line.style = lineStyle
     line.path = XYstring
     # inkex.etree.SubElement(parent, inkex.addNS('path','svg'), drw)
     return line
@@ -106,8 +134,7 @@ def getCircle(r, c):
     (cx, cy) = c
     log("putting circle at (%d,%d)" % (cx, cy))
     circle = inkex.PathElement.arc((cx, cy), r)
-    circle.style = {'stroke': '#000000',
-                    'stroke-width': str(linethickness), 'fill': 'none'}
+    circle.style = lineStyle
     return circle
 
 
@@ -125,28 +152,48 @@ def dimpleStr(tabVector, vectorX, vectorY, dirX,
             tabSgn = -1
         Vxd = vectorX + dirxN * dimpleStart
         Vyd = vectorY + diryN * dimpleStart
-        ds += 'L ' + str(Vxd) + ',' + str(Vyd) + ' '
+        ds += f'L {Vxd},{Vyd} '
         Vxd = Vxd + (tabSgn * dirxN - ddir * dirX) * dimpleHeight
         Vyd = Vyd + (tabSgn * diryN - ddir * dirY) * dimpleHeight
-        ds += 'L ' + str(Vxd) + ',' + str(Vyd) + ' '
+        ds += f'L {Vxd},{Vyd} '
         Vxd = Vxd + tabSgn * dirxN * dimpleLength
         Vyd = Vyd + tabSgn * diryN * dimpleLength
-        ds += 'L ' + str(Vxd) + ',' + str(Vyd) + ' '
+        ds += f'L {Vxd},{Vyd} '
         Vxd = Vxd + (tabSgn * dirxN + ddir * dirX) * dimpleHeight
         Vyd = Vyd + (tabSgn * diryN + ddir * dirY) * dimpleHeight
-        ds += 'L ' + str(Vxd) + ',' + str(Vyd) + ' '
+        ds += f'L {Vxd},{Vyd} '
     return ds
 
 
+def holeStr(x, y, ax, ay, bx, by):
+    # outline of a divider hole or slot: from x,y walk along a, then b,
+    # then back along a and b to the start
+    x1 = x + ax
+    y1 = y + ay
+    x2 = x1 + bx
+    y2 = y1 + by
+    x3 = x2 - ax
+    y3 = y2 - ay
+    x4 = x3 - bx
+    y4 = y3 - by
+    return f'M {x},{y} L {x1},{y1} L {x2},{y2} L {x3},{y3} L {x4},{y4} '
+
+
 def side(group, root, startOffset, endOffset, tabVec, prevTab, length,
          direction, isTab, isDivider, numDividers, dividerSpacing):
     rootX, rootY = root
     startOffsetX, startOffsetY = startOffset
     endOffsetX, endOffsetY = endOffset
     dirX, dirY = direction
-    notTab = 0 if isTab else 1
-
-    if (tabSymmetry == 1):        # waffle-block style rotationally symmetric tabs
+    notTab = not isTab
+    # loop invariants, read once rather than per tab division/divider
+    waffle = tabSymmetry == 1
+    xySymmetric = tabSymmetry == 0
+    addToGroup = group.add
+    # dimples are only drawn on tabbed edges, and are off by default
+    dimples = dimpleHeight > 0 and tabVec != 0
+
+    if waffle:  # waffle-block style rotationally symmetric tabs
         divisions = int((length - 2 * thickness) / nomTab)
         if divisions % 2:
             divisions += 1      # make divs even
@@ -159,7 +206,7 @@ def side(group, root, startOffset, endOffset, tabVec, prevTab, length,
         divisions = float(divisions)
         tabs = (divisions - 1) / 2              # tabs for side
 
-    if (tabSymmetry == 1):        # waffle-block style rotationally symmetric tabs
+    if waffle:  # waffle-block style rotationally symmetric tabs
         gapWidth = tabWidth = (length - 2 * thickness) / divisions
     elif equalTabs:
         gapWidth = tabWidth = length / divisions
@@ -175,21 +222,28 @@ def side(group, root, startOffset, endOffset, tabVec, prevTab, length,
         gapWidth += kerf
         tabWidth -= kerf
         first = -halfkerf
+    # dogbone adjustments to gap and tab lengths, fixed for the whole side
+    gapFirst = 0 if isTab and dogbone else 1
+    gapKerf = dogbone * kerf * isTab
+    tabKerf = dogbone * kerf * notTab
+    # offset of each divider from the start of the side
+    dividerOffsets = [(-dirY * dividerSpacing * dividerNumber,
+                       dirX * dividerSpacing * dividerNumber)
+                      for dividerNumber in range(1, int(numDividers) + 1)]
     firstholelenX = 0
     firstholelenY = 0
-    s = []
-    h = []
+    s = []  # path fragments, joined once the side is complete
     firstVec = 0
     secondVec = tabVec
     dividerEdgeOffsetX = dividerEdgeOffsetY = thickness
-    notDirX = 0 if dirX else 1  # used to select operation on x or y
-    notDirY = 0 if dirY else 1
-    if (tabSymmetry == 1):
+    notDirX = not dirX  # used to select operation on x or y
+    notDirY = not dirY
+    if waffle:
         dividerEdgeOffsetX = dirX * thickness
         # dividerEdgeOffsetY = ;
         vectorX = rootX + (0 if dirX and prevTab else startOffsetX * thickness)
         vectorY = rootY + (0 if dirY and prevTab else startOffsetY * thickness)
-        s = 'M ' + str(vectorX) + ',' + str(vectorY) + ' '
+        s.append(f'M {vectorX},{vectorY} ')
         vectorX = rootX + (startOffsetX if startOffsetX else dirX) * thickness
         vectorY = rootY + (startOffsetY if startOffsetY else dirY) * thickness
         if notDirX and tabVec:
@@ -201,7 +255,7 @@ def side(group, root, startOffset, endOffset, tabVec, prevTab, length,
                               thickness, rootY + startOffsetY * thickness)
         dividerEdgeOffsetX = dirY * thickness
         dividerEdgeOffsetY = dirX * thickness
-        s = 'M ' + str(vectorX) + ',' + str(vectorY) + ' '
+        s.append(f'M {vectorX},{vectorY} ')
         if notDirX:
             vectorY = rootY  # set correct line start for tab generation
         if notDirY:
@@ -216,128 +270,97 @@ def side(group, root, startOffset, endOffset, tabVec, prevTab, length,
         if ((tabDivision % 2) ^ (not isTab)
                 ) and numDividers > 0 and not isDivider:
             w = gapWidth if isTab else tabWidth
-            if tabDivision == 1 and tabSymmetry == 0:
+            if tabDivision == 1 and xySymmetric:
                 w -= startOffsetX * thickness
             holeLenX = dirX * w + notDirX * firstVec + first * dirX
             holeLenY = dirY * w + notDirY * firstVec + first * dirY
             if first:
                 firstholelenX = holeLenX
                 firstholelenY = holeLenY
-            for dividerNumber in range(1, int(numDividers) + 1):
-                Dx = vectorX + -dirY * dividerSpacing * dividerNumber + notDirX * \
+            for (dividerOffsetX, dividerOffsetY) in dividerOffsets:
+                Dx = vectorX + dividerOffsetX + notDirX * \
                     halfkerf + dirX * dogbone * halfkerf - dogbone * first * dirX
-                Dy = vectorY + dirX * dividerSpacing * dividerNumber - notDirY * \
+                Dy = vectorY + dividerOffsetY - notDirY * \
                     halfkerf + dirY * dogbone * halfkerf - dogbone * first * dirY
-                if tabDivision == 1 and tabSymmetry == 0:
+                if tabDivision == 1 and xySymmetric:
                     Dx += startOffsetX * thickness
-                h = 'M ' + str(Dx) + ',' + str(Dy) + ' '
-                Dx = Dx + holeLenX
-                Dy = Dy + holeLenY
-                h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                Dx = Dx + notDirX * (secondVec - kerf)
-                Dy = Dy + notDirY * (secondVec + kerf)
-                h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                Dx = Dx - holeLenX
-                Dy = Dy - holeLenY
-                h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                Dx = Dx - notDirX * (secondVec - kerf)
-                Dy = Dy - notDirY * (secondVec + kerf)
-                h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                group.add(getLine(h))
+                h = holeStr(Dx, Dy, holeLenX, holeLenY, notDirX * (secondVec - kerf),
+                            notDirY * (secondVec + kerf))
+                addToGroup(getLine(h))
         if tabDivision % 2:
             if tabDivision == 1 and numDividers > 0 and isDivider:  # draw slots for dividers to slot into each other
-                for dividerNumber in range(1, int(numDividers) + 1):
-                    Dx = vectorX + -dirY * dividerSpacing * dividerNumber - \
+                for (dividerOffsetX, dividerOffsetY) in dividerOffsets:
+                    Dx = vectorX + dividerOffsetX - \
                         dividerEdgeOffsetX + notDirX * halfkerf
-                    Dy = vectorY + dirX * dividerSpacing * dividerNumber - \
+                    Dy = vectorY + dividerOffsetY - \
                         dividerEdgeOffsetY + notDirY * halfkerf
-                    h = 'M ' + str(Dx) + ',' + str(Dy) + ' '
-                    Dx = Dx + dirX * (first + length / 2)
-                    Dy = Dy + dirY * (first + length / 2)
-                    h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                    Dx = Dx + notDirX * (thickness - kerf)
-                    Dy = Dy + notDirY * (thickness - kerf)
-                    h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                    Dx = Dx - dirX * (first + length / 2)
-                    Dy = Dy - dirY * (first + length / 2)
-                    h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                    Dx = Dx - notDirX * (thickness - kerf)
-                    Dy = Dy - notDirY * (thickness - kerf)
-                    h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-                    group.add(getLine(h))
+                    h = holeStr(Dx, Dy, dirX * (first + length / 2), dirY * (first + length / 2),
+                                notDirX * (thickness - kerf), notDirY * (thickness - kerf))
+                    addToGroup(getLine(h))
             # draw the gap
-            vectorX += dirX * (gapWidth + (isTab & dogbone & 1 ^ 0x1)
-                               * first + dogbone * kerf * isTab) + notDirX * firstVec
-            vectorY += dirY * (gapWidth + (isTab & dogbone & 1 ^ 0x1)
-                               * first + dogbone * kerf * isTab) + notDirY * firstVec
-            s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+            vectorX += dirX * (gapWidth + gapFirst * first +
+                               gapKerf) + notDirX * firstVec
+            vectorY += dirY * (gapWidth + gapFirst * first +
+                               gapKerf) + notDirY * firstVec
+            s.append(f'L {vectorX},{vectorY} ')
             if dogbone and isTab:
                 vectorX -= dirX * halfkerf
                 vectorY -= dirY * halfkerf
-                s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+                s.append(f'L {vectorX},{vectorY} ')
             # draw the starting edge of the tab
-            s += dimpleStr(secondVec, vectorX, vectorY, dirX,
-                           dirY, notDirX, notDirY, 1, isTab)
+            if dimples:
+                s.append(dimpleStr(secondVec, vectorX, vectorY, dirX,
+                                  dirY, notDirX, notDirY, 1, isTab))
             vectorX += notDirX * secondVec
             vectorY += notDirY * secondVec
-            s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+            s.append(f'L {vectorX},{vectorY} ')
             if dogbone and notTab:
                 vectorX -= dirX * halfkerf
                 vectorY -= dirY * halfkerf
-                s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+                s.append(f'L {vectorX},{vectorY} ')
 
         else:
             # draw the tab
-            vectorX += dirX * (tabWidth + dogbone * kerf *
-                               notTab) + notDirX * firstVec
-            vectorY += dirY * (tabWidth + dogbone * kerf *
-                               notTab) + notDirY * firstVec
-            s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+            vectorX += dirX * (tabWidth + tabKerf) + notDirX * firstVec
+            vectorY += dirY * (tabWidth + tabKerf) + notDirY * firstVec
+            s.append(f'L {vectorX},{vectorY} ')
             if dogbone and notTab:
                 vectorX -= dirX * halfkerf
                 vectorY -= dirY * halfkerf
-                s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+                s.append(f'L {vectorX},{vectorY} ')
             # draw the ending edge of the tab
-            s += dimpleStr(secondVec, vectorX, vectorY, dirX,
-                           dirY, notDirX, notDirY, -1, isTab)
+            if dimples:
+                s.append(dimpleStr(secondVec, vectorX, vectorY, dirX,
+                                  dirY, notDirX, notDirY, -1, isTab))
             vectorX += notDirX * secondVec
             vectorY += notDirY * secondVec
-            s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
+            s.append(f'L {vectorX},{vectorY} ')
             if dogbone and isTab:
                 vectorX -= dirX * halfkerf
                 vectorY -= dirY * halfkerf
-                s += 'L ' + str(vectorX) + ',' + str(vectorY) + ' '
-        (secondVec, firstVec) = (-secondVec, -firstVec)  # swap tab direction
+                s.append(f'L {vectorX},{vectorY} ')
+        secondVec = -secondVec  # swap tab direction
+        firstVec = -firstVec
         first = 0
 
     # finish the line off
-    s += 'L ' + str(rootX + endOffsetX * thickness + dirX * length) + ',' + \
-        str(rootY + endOffsetY * thickness + dirY * length) + ' '
+    s.append(f'L {rootX + endOffsetX * thickness + dirX * length},'
+             f'{rootY + endOffsetY * thickness + dirY * length} ')
 
     # draw last for divider joints in side walls
-    if isTab and numDividers > 0 and tabSymmetry == 0 and not isDivider:
-        for dividerNumber in range(1, int(numDividers) + 1):
-            Dx = vectorX + -dirY * dividerSpacing * dividerNumber + notDirX * \
+    if isTab and numDividers > 0 and xySymmetric and not isDivider:
+        for (dividerOffsetX, dividerOffsetY) in dividerOffsets:
+            Dx = vectorX + dividerOffsetX + notDirX * \
                 halfkerf + dirX * dogbone * halfkerf - dogbone * first * dirX
             # Dy=vectorY+dirX*dividerSpacing*dividerNumber-notDirY*halfkerf+dirY*dogbone*halfkerf-dogbone*first*dirY
             # Dx=vectorX+-dirY*dividerSpacing*dividerNumber-dividerEdgeOffsetX+notDirX*halfkerf
-            Dy = vectorY + dirX * dividerSpacing * dividerNumber - \
+            Dy = vectorY + dividerOffsetY - \
                 dividerEdgeOffsetY + notDirY * halfkerf
-            h = 'M ' + str(Dx) + ',' + str(Dy) + ' '
-            Dx = Dx + firstholelenX
-            Dy = Dy + firstholelenY
-            h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-            Dx = Dx + notDirX * (thickness - kerf)
-            Dy = Dy + notDirY * (thickness - kerf)
-            h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-            Dx = Dx - firstholelenX
-            Dy = Dy - firstholelenY
-            h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-            Dx = Dx - notDirX * (thickness - kerf)
-            Dy = Dy - notDirY * (thickness - kerf)
-            h += 'L ' + str(Dx) + ',' + str(Dy) + ' '
-            group.add(getLine(h))
-    group.add(getLine(s))
+            h = holeStr(Dx, Dy, firstholelenX, firstholelenY,
+                        notDirX * (thickness - kerf), notDirY * (thickness - kerf))
+            addToGroup(getLine(h))
+    s = ''.join(s)
+    addToGroup(getLine(s))
     return s
 
 
@@ -404,41 +427,45 @@ class BoxMaker(inkex.Effect):
                                      dest='optimize', default=True, help='Optimize paths')
 
     def effect(self):
-        global group, nomTab, equalTabs, tabSymmetry, dimpleHeight, dimpleLength, thickness, kerf, halfkerf, dogbone, divx, divy, hairline, linethickness, keydivwalls, keydivfloor
+        global group, nomTab, equalTabs, tabSymmetry, dimpleHeight, dimpleLength, thickness, kerf, halfkerf, dogbone, divx, divy, hairline, linethickness, lineStyle, keydivwalls, keydivfloor
 
         # Get access to main SVG document element and get its dimensions.
         svg = self.document.getroot()
+        unittouu = self.svg.unittouu
+        options = self.options
 
         # Get the attributes:
-        widthDoc = self.svg.unittouu(svg.get('width'))
-        heightDoc = self.svg.unittouu(svg.get('height'))
+        widthDoc = unittouu(svg.get('width'))
+        heightDoc = unittouu(svg.get('height'))
 
         # Get script's option values.
-        hairline = self.options.hairline
-        unit = self.options.unit
-        inside = self.options.inside
-        schroff = self.options.schroff
-        kerf = self.svg.unittouu(str(self.options.kerf) + unit)
+        hairline = options.hairline
+        unit = options.unit
+        inside = options.inside
+        schroff = options.schroff
+        kerf = unittouu(str(options.kerf) + unit)
         halfkerf = kerf / 2
 
         # Set the line thickness
         if hairline:
-            linethickness = self.svg.unittouu('0.002in')
+            linethickness = unittouu('0.002in')
         else:
             linethickness = 1
+        lineStyle = {'stroke': '#000000',
+                     'stroke-width': str(linethickness), 'fill': 'none'}
 
         if schroff:
-            rows = self.options.rows
-            rail_height = self.svg.unittouu(
-                str(self.options.rail_height) + unit)
-            row_centre_spacing = self.svg.unittouu(str(122.5) + unit)
-            row_spacing = self.svg.unittouu(
-                str(self.options.row_spacing) + unit)
-            rail_mount_depth = self.svg.unittouu(
-                str(self.options.rail_mount_depth) + unit)
-            rail_mount_centre_offset = self.svg.unittouu(
-                str(self.options.rail_mount_centre_offset) + unit)
-            rail_mount_radius = self.svg.unittouu(str(2.5) + unit)
+            rows = options.rows
+            rail_height = unittouu(
+                str(options.rail_height) + unit)
+            row_centre_spacing = unittouu(str(122.5) + unit)
+            row_spacing = unittouu(
+                str(options.row_spacing) + unit)
+            rail_mount_depth = unittouu(
+                str(options.rail_mount_depth) + unit)
+            rail_mount_centre_offset = unittouu(
+                str(options.rail_mount_centre_offset) + unit)
+            rail_mount_radius = unittouu(str(2.5) + unit)
 
         # minimally different behaviour for schroffmaker.inx vs. boxmaker.inx
         # essentially schroffmaker.inx is just an alternate interface with different
@@ -446,7 +473,7 @@ class BoxMaker(inkex.Effect):
         # logic
         if schroff:
             # schroffmaker.inx
-            X = self.svg.unittouu(str(self.options.hp * 5.08) + unit)
+            X = unittouu(str(options.hp * 5.08) + unit)
             # 122.5mm vertical distance between mounting hole centres of 3U
             # Schroff panels
             row_height = rows * (row_centre_spacing + rail_height)
@@ -456,27 +483,27 @@ class BoxMaker(inkex.Effect):
             Y = row_height + row_spacing_total
         else:
             # boxmaker.inx
-            X = self.svg.unittouu(
-                str(self.options.length + self.options.kerf) + unit)
-            Y = self.svg.unittouu(
-                str(self.options.width + self.options.kerf) + unit)
-
-        Z = self.svg.unittouu(
-            str(self.options.height + self.options.kerf) + unit)
-        thickness = self.svg.unittouu(str(self.options.thickness) + unit)
-        nomTab = self.svg.unittouu(str(self.options.tab) + unit)
-        equalTabs = self.options.equal
-        tabSymmetry = self.options.tabsymmetry
-        dimpleHeight = self.svg.unittouu(str(self.options.dimpleheight) + unit)
-        dimpleLength = self.svg.unittouu(str(self.options.dimplelength) + unit)
-        dogbone = 1 if self.options.tabtype == 1 else 0
-        layout = self.options.style
-        spacing = self.svg.unittouu(str(self.options.spacing) + unit)
-        boxtype = self.options.boxtype
-        divx = self.options.div_l
-        divy = self.options.div_w
-        keydivwalls = 0 if self.options.keydiv == 3 or self.options.keydiv == 1 else 1
-        keydivfloor = 0 if self.options.keydiv == 3 or self.options.keydiv == 2 else 1
+            X = unittouu(
+                str(options.length + options.kerf) + unit)
+            Y = unittouu(
+                str(options.width + options.kerf) + unit)
+
+        Z = unittouu(
+            str(options.height + options.kerf) + unit)
+        thickness = unittouu(str(options.thickness) + unit)
+        nomTab = unittouu(str(options.tab) + unit)
+        equalTabs = options.equal
+        tabSymmetry = options.tabsymmetry
+        dimpleHeight = unittouu(str(options.dimpleheight) + unit)
+        dimpleLength = unittouu(str(options.dimplelength) + unit)
+        dogbone = options.tabtype == 1
+        layout = options.style
+        spacing = unittouu(str(options.spacing) + unit)
+        boxtype = options.boxtype
+        divx = options.div_l
+        divy = options.div_w
+        keydivwalls = options.keydiv not in (1, 3)
+        keydivfloor = options.keydiv not in (2, 3)
         initOffsetX = 0
         initOffsetY = 0
 
@@ -488,35 +515,26 @@ class BoxMaker(inkex.Effect):
         # check input values mainly to avoid python errors
         # TODO restrict values to *correct* solutions
         # TODO restrict divisions to logical values
+        minDim = min(X, Y, Z)
+        maxDim = max(X, Y, Z)
+        checks = (
+            (minDim == 0, 'Error: Dimensions must be non zero'),
+            (maxDim > max(widthDoc, heightDoc) * 10,  # crude test
+             'Error: Dimensions Too Large'),
+            (minDim < 3 * nomTab, 'Error: Tab size too large'),
+            (nomTab < thickness, 'Error: Tab size too small'),
+            (thickness == 0, 'Error: Thickness is zero'),
+            (thickness > minDim / 3, 'Error: Material too thick'),  # crude test
+            (kerf > minDim / 3, 'Error: Kerf too large'),  # crude test
+            (spacing > maxDim * 10, 'Error: Spacing too large'),  # crude test
+            (spacing < kerf, 'Error: Spacing too small'),
+        )
         error = False
-
-        if min(X, Y, Z) == 0:
-            inkex.errormsg(_('Error: Dimensions must be non zero'))
-            error = True
-        if max(X, Y, Z) > max(widthDoc, heightDoc) * 10:  # crude test
-            inkex.errormsg(_('Error: Dimensions Too Large'))
-            error = True
-        if min(X, Y, Z) < 3 * nomTab:
-            inkex.errormsg(_('Error: Tab size too large'))
-            error = True
-        if nomTab < thickness:
-            inkex.errormsg(_('Error: Tab size too small'))
-            error = True
-        if thickness == 0:
-            inkex.errormsg(_('Error: Thickness is zero'))
-            error = True
-        if thickness > min(X, Y, Z) / 3:  # crude test
-            inkex.errormsg(_('Error: Material too thick'))
-            error = True
-        if kerf > min(X, Y, Z) / 3:  # crude test
-            inkex.errormsg(_('Error: Kerf too large'))
-            error = True
-        if spacing > max(X, Y, Z) * 10:  # crude test
-            inkex.errormsg(_('Error: Spacing too large'))
-            error = True
-        if spacing < kerf:
-            inkex.errormsg(_('Error: Spacing too small'))
-            error = True
+        for failed, message in checks:
+            if failed:
+                # only translate messages that are actually shown
+                inkex.errormsg(_(message))
+                error = True
 
         if error:
             exit()
@@ -526,88 +544,25 @@ class BoxMaker(inkex.Effect):
         # tp=top, bm=bottom, ft=front, bk=back, lt=left, rt=right
 
         # Determine which faces the box has based on the box type
-        hasTp = hasBm = hasFt = hasBk = hasLt = hasRt = True
-        if boxtype == 2:
-            hasTp = False
-        elif boxtype == 3:
-            hasTp = hasFt = False
-        elif boxtype == 4:
-            hasTp = hasFt = hasRt = False
-        elif boxtype == 5:
-            hasTp = hasBm = False
-        elif boxtype == 6:
-            hasTp = hasFt = hasBk = hasRt = False
-        # else boxtype==1, full box, has all sides
+        faces = boxTypeFaces.get(boxtype, boxTypeFaces[1])
+        (hasTp, hasBm, hasFt, hasBk, hasLt, hasRt) = faces
 
         # Determine where the tabs go based on the tab style
-        if tabSymmetry == 2:     # Antisymmetric (deprecated)
-            tpTabInfo = 0b0110
-            bmTabInfo = 0b1100
-            ltTabInfo = 0b1100
-            rtTabInfo = 0b0110
-            ftTabInfo = 0b1100
-            bkTabInfo = 0b1001
-        elif tabSymmetry == 1:   # Rotationally symmetric (Waffle-blocks)
-            tpTabInfo = 0b1111
-            bmTabInfo = 0b1111
-            ltTabInfo = 0b1111
-            rtTabInfo = 0b1111
-            ftTabInfo = 0b1111
-            bkTabInfo = 0b1111
-        else:               # XY symmetric
-            tpTabInfo = 0b0000
-            bmTabInfo = 0b0000
-            ltTabInfo = 0b1111
-            rtTabInfo = 0b1111
-            ftTabInfo = 0b1010
-            bkTabInfo = 0b1010
-
-        def fixTabBits(tabbed, tabInfo, bit):
-            newTabbed = tabbed & ~bit
-            if inside:
-                newTabInfo = tabInfo | bit      # set bit to 1 to use tab base line
-            else:
-                newTabInfo = tabInfo & ~bit     # set bit to 0 to use tab tip line
-            return newTabbed, newTabInfo
-
-        # Update the tab bits based on which sides of the box don't exist
-        tpTabbed = bmTabbed = ltTabbed = rtTabbed = ftTabbed = bkTabbed = 0b1111
-        if not hasTp:
-            bkTabbed, bkTabInfo = fixTabBits(bkTabbed, bkTabInfo, 0b0010)
-            ftTabbed, ftTabInfo = fixTabBits(ftTabbed, ftTabInfo, 0b1000)
-            ltTabbed, ltTabInfo = fixTabBits(ltTabbed, ltTabInfo, 0b0001)
-            rtTabbed, rtTabInfo = fixTabBits(rtTabbed, rtTabInfo, 0b0100)
-            tpTabbed = 0
-        if not hasBm:
-            bkTabbed, bkTabInfo = fixTabBits(bkTabbed, bkTabInfo, 0b1000)
-            ftTabbed, ftTabInfo = fixTabBits(ftTabbed, ftTabInfo, 0b0010)
-            ltTabbed, ltTabInfo = fixTabBits(ltTabbed, ltTabInfo, 0b0100)
-            rtTabbed, rtTabInfo = fixTabBits(rtTabbed, rtTabInfo, 0b0001)
-            bmTabbed = 0
-        if not hasFt:
-            tpTabbed, tpTabInfo = fixTabBits(tpTabbed, tpTabInfo, 0b1000)
-            bmTabbed, bmTabInfo = fixTabBits(bmTabbed, bmTabInfo, 0b1000)
-            ltTabbed, ltTabInfo = fixTabBits(ltTabbed, ltTabInfo, 0b1000)
-            rtTabbed, rtTabInfo = fixTabBits(rtTabbed, rtTabInfo, 0b1000)
-            ftTabbed = 0
-        if not hasBk:
-            tpTabbed, tpTabInfo = fixTabBits(tpTabbed, tpTabInfo, 0b0010)
-            bmTabbed, bmTabInfo = fixTabBits(bmTabbed, bmTabInfo, 0b0010)
-            ltTabbed, ltTabInfo = fixTabBits(ltTabbed, ltTabInfo, 0b0010)
-            rtTabbed, rtTabInfo = fixTabBits(rtTabbed, rtTabInfo, 0b0010)
-            bkTabbed = 0
-        if not hasLt:
-            tpTabbed, tpTabInfo = fixTabBits(tpTabbed, tpTabInfo, 0b0100)
-            bmTabbed, bmTabInfo = fixTabBits(bmTabbed, bmTabInfo, 0b0001)
-            bkTabbed, bkTabInfo = fixTabBits(bkTabbed, bkTabInfo, 0b0001)
-            ftTabbed, ftTabInfo = fixTabBits(ftTabbed, ftTabInfo, 0b0001)
-            ltTabbed = 0
-        if not hasRt:
-            tpTabbed, tpTabInfo = fixTabBits(tpTabbed, tpTabInfo, 0b0001)
-            bmTabbed, bmTabInfo = fixTabBits(bmTabbed, bmTabInfo, 0b0100)
-            bkTabbed, bkTabInfo = fixTabBits(bkTabbed, bkTabInfo, 0b0100)
-            ftTabbed, ftTabInfo = fixTabBits(ftTabbed, ftTabInfo, 0b0100)
-            rtTabbed = 0
+        tabInfo = list(tabStyleInfo.get(tabSymmetry, tabStyleInfo[0]))
+
+        # Update the tab bits based on which sides of the box don't exist.
+        # Each fixed bit is cleared in tabbed, and in tabInfo set to 1 to use
+        # the tab base line when inside, or to 0 to use the tab tip line
+        insideBits = -1 if inside else 0
+        tabbed = [0b1111] * 6
+        for face, neighbours in missingFaceTabBits:
+            if not faces[face]:
+                for other, bit in neighbours:
+                    tabbed[other] &= ~bit
+                    tabInfo[other] = (tabInfo[other] & ~bit) | (bit & insideBits)
+                tabbed[face] = 0
+        (tpTabbed, bmTabbed, ftTabbed, bkTabbed, ltTabbed, rtTabbed) = tabbed
+        (tpTabInfo, bmTabInfo, ftTabInfo, bkTabInfo, ltTabInfo, rtTabInfo) = tabInfo
 
         # Layout positions are specified in a grid of rows and columns
         row0 = (1, 0, 0, 0)      # top row
@@ -647,8 +602,8 @@ class BoxMaker(inkex.Effect):
         # Y-divider template respectively
         pieces = []
         if layout == 1:  # Diagramatic Layout
-            rr = deepcopy([row0, row1z, row2])
-            cc = deepcopy([col0, col1z, col2xz, col3xzz])
+            rr = [row0, row1z, row2]
+            cc = [col0, col1z, col2xz, col3xzz]
             if not hasFt:
                 # remove row0, shift others up by Z
                 reduceOffsets(rr, 0, 0, 0, 1)
@@ -675,8 +630,8 @@ class BoxMaker(inkex.Effect):
                 pieces.append(
                     [cc[1], rr[0], X, Z, ftTabInfo, ftTabbed, ftFace])
         elif layout == 2:  # 3 Piece Layout
-            rr = deepcopy([row0, row1y])
-            cc = deepcopy([col0, col1z])
+            rr = [row0, row1y]
+            cc = [col0, col1z]
             if hasBk:
                 pieces.append(
                     [cc[1], rr[1], X, Z, bkTabInfo, bkTabbed, bkFace])
@@ -687,8 +642,8 @@ class BoxMaker(inkex.Effect):
                 pieces.append(
                     [cc[1], rr[0], X, Y, bmTabInfo, bmTabbed, bmFace])
         elif layout == 3:  # Inline(compact) Layout
-            rr = deepcopy([row0])
-            cc = deepcopy([col0, col1x, col2xx, col3xxz, col4, col5])
+            rr = [row0]
+            cc = [col0, col1x, col2xx, col3xxz, col4, col5]
             if not hasTp:
                 # remove col0, shift others left by X
                 reduceOffsets(cc, 0, 1, 0, 0)
@@ -719,6 +674,10 @@ class BoxMaker(inkex.Effect):
                 pieces.append(
                     [cc[5], rr[0], X, Z, ftTabInfo, ftTabbed, ftFace])
 
+        # divider spacing is the same for every piece
+        xspacing = (X - thickness) / (divy + 1)
+        yspacing = (Y - thickness) / (divx + 1)
+
         # generate and draw each piece of the box
         for idx, piece in enumerate(pieces):
             (xs, xx, xy, xz) = piece[0]
@@ -739,13 +698,15 @@ class BoxMaker(inkex.Effect):
             btabs = tabbed >> 2 & 1
             ctabs = tabbed >> 1 & 1
             dtabs = tabbed & 1  # extract tabbed flag for each side
-            xspacing = (X - thickness) / (divy + 1)
-            yspacing = (Y - thickness) / (divx + 1)
-            xholes = 1 if piece[6] < 3 else 0
-            yholes = 1 if piece[6] != 2 else 0
-            wall = 1 if piece[6] > 1 else 0
-            floor = 1 if piece[6] == 1 else 0
-            railholes = 1 if piece[6] == 3 else 0
+            xholes = piece[6] < 3
+            yholes = piece[6] != 2
+            wall = piece[6] > 1
+            floor = piece[6] == 1
+            railholes = piece[6] == 3
+            # how many X and Y divider holes to key into this piece's sides
+            divKeyed = (keydivfloor | wall) * (keydivwalls | floor)
+            divxHoles = divKeyed * divx * yholes
+            divyHoles = divKeyed * divy * xholes
 
             group = newGroup(self)
             groups = [group]
@@ -783,29 +744,25 @@ class BoxMaker(inkex.Effect):
                         group.add(getCircle(rail_mount_radius, (rhx, rh2y)))
                         rystart += row_centre_spacing + row_spacing + rail_height
 
-            # generate and draw the sides of each piece
-            side(group, (x, y), (d, a), (-b, a), atabs * (-thickness if a else thickness), dtabs, dx, (1, 0), a,
-                 # side a
-                 0, (keydivfloor | wall) * (keydivwalls | floor) * divx * yholes * atabs, yspacing)
-            side(group, (x + dx, y), (-b, a), (-b, -c), btabs * (thickness if b else -thickness), atabs, dy, (0, 1),
-                 # side b
-                 b, 0, (keydivfloor | wall) * (keydivwalls | floor) * divy * xholes * btabs, xspacing)
-            if atabs:
-                side(group, (x + dx, y + dy), (-b, -c), (d, -c), ctabs *
-                     # side c
-                     (thickness if c else -thickness), btabs, dx, (-1, 0), c, 0, 0, 0)
-            else:
-                side(group, (x + dx, y + dy), (-b, -c), (d, -c), ctabs * (thickness if c else -thickness), btabs, dx,
-                     # side c
-                     (-1, 0), c, 0, (keydivfloor | wall) * (keydivwalls | floor) * divx * yholes * ctabs, yspacing)
-            if btabs:
-                side(group, (x, y + dy), (d, -c), (d, a), dtabs *
-                     # side d
-                     (-thickness if d else thickness), ctabs, dy, (0, -1), d, 0, 0, 0)
-            else:
-                side(group, (x, y + dy), (d, -c), (d, a), dtabs * (-thickness if d else thickness), ctabs, dy, (0, -1),
-                     # side d
-                     d, 0, (keydivfloor | wall) * (keydivwalls | floor) * divy * xholes * dtabs, xspacing)
+            # generate and draw the sides of each piece, one row per side:
+            # (root, startOffset, endOffset, tabVec, prevTab, length, direction,
+            #  isTab, isDivider, numDividers, dividerSpacing)
+            edges = (
+                # side a
+                ((x, y), (d, a), (-b, a), atabs * (-thickness if a else thickness), dtabs, dx, (1, 0),
+                 a, 0, divxHoles * atabs, yspacing),
+                # side b
+                ((x + dx, y), (-b, a), (-b, -c), btabs * (thickness if b else -thickness), atabs, dy, (0, 1),
+                 b, 0, divyHoles * btabs, xspacing),
+                # side c, divider holes only if side a is not tabbed
+                ((x + dx, y + dy), (-b, -c), (d, -c), ctabs * (thickness if c else -thickness), btabs, dx, (-1, 0),
+                 c, 0, 0 if atabs else divxHoles * ctabs, yspacing),
+                # side d, divider holes only if side b is not tabbed
+                ((x, y + dy), (d, -c), (d, a), dtabs * (-thickness if d else thickness), ctabs, dy, (0, -1),
+                 d, 0, 0 if btabs else divyHoles * dtabs, xspacing),
+            )
+            for edge in edges:
+                side(group, *edge)
 
             if idx == 0:
                 # remove tabs from dividers if not required
@@ -852,7 +809,7 @@ class BoxMaker(inkex.Effect):
                          # side d
                          (-thickness if d else thickness), ctabs, dy, (0, -1), d, 1, 0, 0)
 
-            if self.options.optimize:
+            if options.optimize:
                 # Step 1: Combine paths to form the outer boundary
                 for group in groups:
                     for path_element in [child for child in group.descendants(
@@ -4,9 +4,9 @@ Generates Inkscape SVG file containing box components needed to
 CNC (laser/mill) cut a box with tabbed joints taking kerf and clearance into account
 '''
 
-from boxmaker.BoxMaker import BoxMaker
-
 # Create effect instance and apply it.
 def main():
+  # imported here so importing this module does not pull in inkex
+  from boxmaker.BoxMaker import BoxMaker
   effect = BoxMaker()
   effect.run()